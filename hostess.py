@@ -19,9 +19,11 @@
 # """
 
 
+import os
 import tkinter as tk
 from model import HostsFileManager
 from model import initialize
+from model import stats
 
 
 class Counter(object):
@@ -123,8 +125,6 @@ class Application(tk.Tk):
         """
         tk.Tk.__init__(self)
         self.grid()
-        self.address_manager = HostsFileManager()
-        self.session_backup = self.address_manager.backup
 
         # these are defined in create_widgets()
         self.address_label = None
@@ -134,7 +134,13 @@ class Application(tk.Tk):
         self.remove_button = None
         self.add_new_button = None
         self.add_new_text = None
-        self.create_widgets()
+        self.stats_label = None
+        # time reading /etc/hosts and the first listbox fill as one operation
+        with stats.timer("startup"):
+            self.address_manager = HostsFileManager()
+            self.session_backup = self.address_manager.backup
+            self.create_widgets()
+        self.update_stats()
         self.menubar = None
         self.filemenu = None
         self.create_menubar()
@@ -204,7 +210,8 @@ class Application(tk.Tk):
 
         :return: None
         """
-        self.address_manager.write()
+        with stats.timer("save"):
+            self.address_manager.write()
         # TODO: Check if the save was successful?  
         self.destroy()
 
@@ -223,12 +230,13 @@ class Application(tk.Tk):
         Separated for DRYness.
         :return: None
         """
-        for i in range(len(self.address_manager.managed)):
-            address = self.address_manager.managed[i]
-            self.address_window.insert("end",
-                                       address.display)
-            if address.blocked is True:
-                self.address_window.select_set(i)
+        with stats.timer("gui.populate"):
+            for i in range(len(self.address_manager.managed)):
+                address = self.address_manager.managed[i]
+                self.address_window.insert("end",
+                                           address.display)
+                if address.blocked is True:
+                    self.address_window.select_set(i)
 
     def on_listbox_select(self, event):
         """
@@ -256,6 +264,16 @@ class Application(tk.Tk):
         :return: None
         """
         self.save_button.config(text="Save*")
+
+    def update_stats(self):
+        """
+        Shows the last operation's timings in the status panel, only present
+        when HOSTESS_STATS is set.
+
+        :return: None
+        """
+        if self.stats_label is not None:
+            self.stats_label.config(text=stats.summary())
         
     def on_refreshed(self):
         """
@@ -299,6 +317,10 @@ class Application(tk.Tk):
         self.add_new_button = tk.Button(self, text="Add New",
                                         command=self.on_click_add_new)
         self.add_new_text = tk.Entry(self)
+        if stats.enabled:
+            self.stats_label = tk.Label(self, text=stats.summary(),
+                                        anchor="w", justify="left",
+                                        wraplength=480)
 
         # display widgets
         self.address_label.grid(row=row.current(),
@@ -313,6 +335,10 @@ class Application(tk.Tk):
                                  column=col.next())
         self.add_new_text.grid(row=row.current(),
                                column=col.next())
+        if self.stats_label is not None:
+            self.stats_label.grid(row=row.next(),
+                                  column=col.reset(), columnspan=4,
+                                  sticky="w")
 
         # bind events
         self.address_window.bind('<<ListboxSelect>>', self.on_listbox_select)
@@ -333,9 +359,11 @@ class Application(tk.Tk):
 
         :return: None
         """
-        self.address_window.delete(0, "end")
-        self.populate_listbox()
-        self.on_refreshed()
+        with stats.timer("gui.refresh"):
+            self.address_window.delete(0, "end")
+            self.populate_listbox()
+            self.on_refreshed()
+        self.update_stats()
 
     def reset(self):
         """
@@ -364,11 +392,23 @@ class Application(tk.Tk):
 
         :return: None
         """
-        self.address_manager.write()
-        self.refresh()
+        with stats.timer("save"):
+            self.address_manager.write()
+            self.refresh()
+        self.update_stats()
+
+
+def main():
+    """ Start Hostess.  :return: None """
+    initialize()
+    app = Application()
+    app.title('Hostess')
+    app.mainloop()
 
 
-initialize()
-app = Application()
-app.title('Hostess')
-app.mainloop()
+if stats.mode == "profile":
+    import cProfile
+    cProfile.run('main()', os.path.join(os.path.expanduser('~'),
+                                        '.hostess/hostess.prof'))
+else:
+    main()
@@ -21,6 +21,153 @@
 import os
 import re
 import json
+import time
+import atexit
+import warnings
+
+
+# lines marking the section of /etc/hosts that Hostess manages
+BEGIN_OWNERSHIP = '# begin Hostess ownership\n'
+END_OWNERSHIP = '# end Hostess ownership\n'
+
+# accepted values of the HOSTESS_STATS environment variable
+STATS_MODES = ("json", "profile")
+
+
+class _NullTimer(object):
+    """ Do-nothing context manager handed out while Stats is disabled. """
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer(object):
+    """ Context manager that records its wall time in a Stats object. """
+    def __init__(self, stats, name):
+        self.stats = stats
+        self.name = name
+        self.start = None
+
+    def __enter__(self):
+        if self.stats.depth == 0:
+            # outermost timer, this is the start of a new operation
+            self.stats.last = {}
+            self.stats.last_op = self.name
+        self.stats.depth += 1
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        self.stats.depth -= 1
+        self.stats.add_time(self.name, elapsed)
+        return False
+
+
+class Stats(object):
+    """
+    Collects operation timings and counters.
+
+    Turned on by setting the HOSTESS_STATS environment variable to "json"
+    (timings and counters are written to ~/.hostess/stats.json on exit) or
+    "profile" (hostess.py also runs under cProfile and writes
+    ~/.hostess/hostess.prof).  Any other value leaves it off.  When off,
+    timer() and count() do nothing.
+
+    Attributes:
+    mode: string, "json", "profile" or None (disabled)
+    enabled: boolean, is anything being recorded?
+    timings: dict, name -> {"calls": int, "total": float, "max": float}
+    counters: dict, name -> int
+    last_op: string, name of the most recent outermost timer
+    last: dict, name -> seconds for every timer inside last_op
+    """
+    def __init__(self, mode=None):
+        """
+        :param mode: string, "json", "profile" or None (anything else is
+                     treated as None)
+        :return: self
+        """
+        object.__init__(self)
+        if mode not in STATS_MODES:
+            mode = None
+        self.mode = mode
+        self.enabled = mode is not None
+        self.timings = {}
+        self.counters = {}
+        self.depth = 0
+        self.last_op = None
+        self.last = {}
+
+    def timer(self, name):
+        """
+        :param name: string, i.e. "read" or "write.privileged"
+        :return: context manager timing the enclosed block
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name)
+
+    def add_time(self, name, elapsed):
+        """
+        Record one timed call.
+
+        :param name: string
+        :param elapsed: float, seconds
+        :return: None
+        """
+        t = self.timings.setdefault(name, {"calls": 0, "total": 0.0,
+                                           "max": 0.0})
+        t["calls"] += 1
+        t["total"] += elapsed
+        t["max"] = max(t["max"], elapsed)
+        self.last[name] = self.last.get(name, 0.0) + elapsed
+
+    def count(self, name, n=1):
+        """
+        Increment a counter.
+
+        :param name: string, i.e. "lines_parsed"
+        :param n: integer, amount to add
+        :return: None
+        """
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def summary(self):
+        """ :return: string, one line with the last operation's timings """
+        if self.last_op is None:
+            return "No operations timed yet"
+        parts = ["%s %.1fms" % (k, v * 1000)
+                 for k, v in sorted(self.last.items(), key=lambda kv: -kv[1])]
+        return "Last: " + ", ".join(parts)
+
+    def dump(self, path=None):
+        """
+        Write timings and counters to a json file.
+
+        :param path: string, defaults to ~/.hostess/stats.json
+        :return: None
+        """
+        if path is None:
+            path = os.path.join(os.path.expanduser('~'), '.hostess/stats.json')
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        f = open(path, 'w')
+        json.dump({"timings": self.timings, "counters": self.counters}, f,
+                  indent=2, sort_keys=True)
+        f.close()
+
+
+stats = Stats(os.environ.get('HOSTESS_STATS'))
+if os.environ.get('HOSTESS_STATS') and not stats.enabled:
+    warnings.warn("HOSTESS_STATS must be one of %s, stats are off"
+                  % ", ".join(STATS_MODES))
+if stats.enabled:
+    atexit.register(stats.dump)
 
 
 def backup():
@@ -33,11 +180,13 @@ def backup():
     p = os.path.join(os.path.expanduser('~'), '.hostess')
     os.makedirs(p, exist_ok=True)
 
-    if 'hosts_backup_original' in os.listdir(p):
-        # TODO: add timestamp to backups
-        os.system('cp /etc/hosts ~/.hostess/hosts_backup_recent')
-    else:
-        os.system('cp /etc/hosts ~/.hostess/hosts_backup_original')
+    with stats.timer("backup"):
+        stats.count("subprocess_spawns")
+        if 'hosts_backup_original' in os.listdir(p):
+            # TODO: add timestamp to backups
+            os.system('cp /etc/hosts ~/.hostess/hosts_backup_recent')
+        else:
+            os.system('cp /etc/hosts ~/.hostess/hosts_backup_original')
 
 
 def initialize():
@@ -147,6 +296,8 @@ class HostsFileManager(object):
     pre_own: list of portion of hosts file before Hostess owned lines
     post_own: list....after Hostess owned lines
     managed: list of Address objects of managed web addresses
+    saved: dict, display -> blocked for the managed addresses as last read
+           from or written to /etc/hosts
     """
 
     def __init__(self):
@@ -160,6 +311,7 @@ class HostsFileManager(object):
         self.pre_own = []
         self.post_own = []
         self.managed = []
+        self.saved = {}
         self.read()
         self.profile_name = None
 
@@ -169,14 +321,26 @@ class HostsFileManager(object):
     def __eq__(self, other):
         """
         Override equality comparison, used to check if file state matches
-            GUI/controller state.  Ignores self.backup
+            GUI/controller state.  Ignores self.backup and self.saved
         :param other: HostsFileManager object
         :return: boolean
         """
         # the backup attributes must be filtered out because if the file
         # has changed they'll be different
-        return {k: v for k, v in self.__dict__.items() if k != "backup"} \
-               == {k: v for k, v in other.__dict__.items() if k != "backup"}
+        ignored = ("backup", "saved")
+        return {k: v for k, v in self.__dict__.items() if k not in ignored} \
+               == {k: v for k, v in other.__dict__.items() if k not in ignored}
+
+    def changed_count(self):
+        """
+        Count the managed addresses that were added, removed, blocked or
+        unblocked since /etc/hosts was last read or written.
+
+        :return: integer
+        """
+        current = {a.display: a.blocked for a in self.managed}
+        return len([d for d in set(current) | set(self.saved)
+                    if current.get(d) != self.saved.get(d)])
         
     def read(self):
         """
@@ -184,22 +348,27 @@ class HostsFileManager(object):
 
         :return: None
         """
-        f = open('/etc/hosts', 'r')
-        hosts_list = f.readlines()
-        self.backup = hosts_list
-        f.close()  # it isn't locked anyway...
-
-        if '# begin Hostess ownership\n' in hosts_list:
-            start_ownership = hosts_list.index('# begin Hostess ownership\n')
-            end_ownership = hosts_list.index('# end Hostess ownership\n')
-
-            # save everything before and after the ownership tags
-            self.pre_own = hosts_list[:start_ownership]
-            self.post_own = hosts_list[end_ownership+1:]
-            owned_raw = hosts_list[start_ownership+1:end_ownership]
-            self.managed = [Address.new_from_host(a) for a in owned_raw]
-        else:
-            self.pre_own = hosts_list
+        with stats.timer("read"):
+            f = open('/etc/hosts', 'r')
+            hosts_list = f.readlines()
+            self.backup = hosts_list
+            f.close()  # it isn't locked anyway...
+
+            with stats.timer("read.parse"):
+                if BEGIN_OWNERSHIP in hosts_list:
+                    start_ownership = hosts_list.index(BEGIN_OWNERSHIP)
+                    end_ownership = hosts_list.index(END_OWNERSHIP)
+
+                    # save everything before and after the ownership tags
+                    self.pre_own = hosts_list[:start_ownership]
+                    self.post_own = hosts_list[end_ownership+1:]
+                    owned_raw = hosts_list[start_ownership+1:end_ownership]
+                    self.managed = [Address.new_from_host(a) for a in owned_raw]
+                    stats.count("addresses_parsed", len(owned_raw))
+                else:
+                    self.pre_own = hosts_list
+            stats.count("lines_parsed", len(hosts_list))
+            self.saved = {a.display: a.blocked for a in self.managed}
 
     def write(self):
         """
@@ -208,28 +377,40 @@ class HostsFileManager(object):
 
         :return: None
         """
-
-        owned = [a.text() for a in self.managed]
-
-        out_list = []
-        if len(self.pre_own) > 0:
-            for i in self.pre_own:
-                out_list.append(i)
-        if len(owned) > 0:
-            out_list.append('# begin Hostess ownership\n')
-            for i in owned:
-                out_list.append(i)
-            out_list.append('# end Hostess ownership\n')
-        if len(self.post_own) > 0:
-            for i in self.post_own:
-                out_list.append(i)
-
-        out_text = ''.join(out_list)
-        outfile = open('/tmp/temp_hosts.tmp', 'wt')
-        outfile.write(out_text)
-        outfile.close()
-
-        os.system('gksudo mv /tmp/temp_hosts.tmp /etc/hosts')
+        with stats.timer("write"):
+            owned = [a.text() for a in self.managed]
+
+            if stats.enabled:
+                stats.count("addresses_changed", self.changed_count())
+
+            with stats.timer("write.render"):
+                out_list = []
+                if len(self.pre_own) > 0:
+                    for i in self.pre_own:
+                        out_list.append(i)
+                if len(owned) > 0:
+                    out_list.append(BEGIN_OWNERSHIP)
+                    for i in owned:
+                        out_list.append(i)
+                    out_list.append(END_OWNERSHIP)
+                if len(self.post_own) > 0:
+                    for i in self.post_own:
+                        out_list.append(i)
+
+                out_text = ''.join(out_list)
+
+            with stats.timer("write.tempfile"):
+                outfile = open('/tmp/temp_hosts.tmp', 'wt')
+                outfile.write(out_text)
+                outfile.close()
+                stats.count("bytes_written", len(out_text.encode()))
+
+            with stats.timer("write.privileged"):
+                stats.count("subprocess_spawns")
+                status = os.system('gksudo mv /tmp/temp_hosts.tmp /etc/hosts')
+
+            if status == 0:
+                self.saved = {a.display: a.blocked for a in self.managed}
 
     def new(self, address):
         """
@@ -0,0 +1,158 @@
+# Tests for the timing/counter instrumentation in model.py
+#
+# Run with "python3 -m unittest test_stats" from the hostess folder.  Nothing
+# here touches the real /etc/hosts or calls gksudo.
+
+
+import os
+import json
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import model
+from model import Address
+from model import HostsFileManager
+from model import Stats
+
+
+class StatsTest(unittest.TestCase):
+    """ Stats and its timers on their own. """
+
+    def test_disabled_is_a_no_op(self):
+        stats = Stats()
+        self.assertFalse(stats.enabled)
+        self.assertIs(stats.timer("a"), stats.timer("b"))
+        with stats.timer("a"):
+            stats.count("lines_parsed", 3)
+        self.assertEqual(stats.timings, {})
+        self.assertEqual(stats.counters, {})
+        self.assertIsNone(stats.last_op)
+
+    def test_only_known_modes_enable(self):
+        for mode in ("0", "profle", "", None):
+            self.assertFalse(Stats(mode).enabled, mode)
+        for mode in ("json", "profile"):
+            self.assertTrue(Stats(mode).enabled, mode)
+
+    def test_nested_timers_form_one_operation(self):
+        stats = Stats("json")
+        with stats.timer("first"):
+            pass
+        with stats.timer("save"):
+            with stats.timer("write"):
+                pass
+            with stats.timer("write"):
+                pass
+        self.assertEqual(stats.depth, 0)
+        self.assertEqual(stats.last_op, "save")
+        # the earlier operation is cleared from last but kept in timings
+        self.assertEqual(sorted(stats.last), ["save", "write"])
+        self.assertEqual(stats.timings["write"]["calls"], 2)
+        self.assertEqual(stats.timings["first"]["calls"], 1)
+
+    def test_summary_is_slowest_first(self):
+        stats = Stats("json")
+        self.assertEqual(stats.summary(), "No operations timed yet")
+        stats.last_op = "save"
+        stats.last = {"write": 0.002, "save": 0.003}
+        self.assertEqual(stats.summary(), "Last: save 3.0ms, write 2.0ms")
+
+    def test_count(self):
+        stats = Stats("json")
+        stats.count("subprocess_spawns")
+        stats.count("subprocess_spawns")
+        stats.count("bytes_written", 10)
+        self.assertEqual(stats.counters,
+                         {"subprocess_spawns": 2, "bytes_written": 10})
+
+    def test_dump(self):
+        stats = Stats("json")
+        with stats.timer("read"):
+            stats.count("lines_parsed", 2)
+        d = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, d)
+        path = os.path.join(d, "nested", "stats.json")
+        stats.dump(path)
+        with open(path) as f:
+            data = json.load(f)
+        self.assertEqual(data["counters"], {"lines_parsed": 2})
+        self.assertEqual(data["timings"]["read"]["calls"], 1)
+
+
+class RoundTripTest(unittest.TestCase):
+    """ Counters for HostsFileManager.read()/write() on a fake hosts file. """
+
+    HOSTS = ['127.0.0.1\tlocalhost\n',
+             model.BEGIN_OWNERSHIP,
+             '127.0.1.1\ta.com\n',
+             '#127.0.1.1\tb.com\n',
+             model.END_OWNERSHIP]
+
+    def setUp(self):
+        d = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, d)
+        self.paths = {'/etc/hosts': os.path.join(d, 'hosts'),
+                      '/tmp/temp_hosts.tmp': os.path.join(d, 'temp_hosts')}
+        with open(self.paths['/etc/hosts'], 'w') as f:
+            f.write(''.join(self.HOSTS))
+
+        real_open = open
+
+        def fake_open(path, *args, **kwargs):
+            return real_open(self.paths.get(path, path), *args, **kwargs)
+
+        def fake_system(command):
+            # stands in for 'gksudo mv /tmp/temp_hosts.tmp /etc/hosts'
+            shutil.move(self.paths['/tmp/temp_hosts.tmp'],
+                        self.paths['/etc/hosts'])
+            return 0
+
+        self.stats = Stats("json")
+        for patcher in (mock.patch('model.open', fake_open, create=True),
+                        mock.patch('model.os.system', fake_system),
+                        mock.patch('model.stats', self.stats)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_read_counts_lines(self):
+        manager = HostsFileManager()
+        self.assertEqual(manager.managed,
+                         [Address('a.com', True), Address('b.com', False)])
+        self.assertEqual(self.stats.counters,
+                         {"lines_parsed": 5, "addresses_parsed": 2})
+
+    def test_write_counts_changes_since_last_write(self):
+        manager = HostsFileManager()
+        manager.managed[0].set_unblocked()
+        manager.write()
+        self.assertEqual(self.stats.counters["addresses_changed"], 1)
+        self.assertEqual(self.stats.counters["subprocess_spawns"], 1)
+        with open(self.paths['/etc/hosts']) as f:
+            written = f.read()
+        self.assertIn('#127.0.1.1\ta.com\n', written)
+        self.assertEqual(self.stats.counters["bytes_written"],
+                         len(written.encode()))
+
+        # nothing changed since the last write
+        manager.write()
+        self.assertEqual(self.stats.counters["addresses_changed"], 1)
+
+        manager.new('c.com')
+        manager.remove('b.com')
+        manager.write()
+        self.assertEqual(self.stats.counters["addresses_changed"], 3)
+        self.assertEqual(manager, HostsFileManager())
+
+    def test_write_timings(self):
+        manager = HostsFileManager()
+        manager.write()
+        self.assertEqual(self.stats.last_op, "write")
+        self.assertEqual(sorted(self.stats.last),
+                         ["write", "write.privileged", "write.render",
+                          "write.tempfile"])
+
+
+if __name__ == '__main__':
+    unittest.main()